@@ -33,17 +33,29 @@ class VoiceRow(Adw.ActionRow):
     spinner = Gtk.Template.Child()
     btn_remove = Gtk.Template.Child()
 
-    def __init__(self, voice):
+    def __init__(self):
         super().__init__()
+        self.voice = None
+        self._status_handler = 0
+
+    def bind(self, voice):
         self.voice = voice
-        self.voice.connect("notify::status", self.status_changed)
+        self._status_handler = self.voice.connect("notify::status", self.status_changed)
         self.set_title(voice.name)
         self.set_subtitle(voice.provider_name)
-        lang_names = self.voice.language_and_region_names
-        self.language_label.set_label(", ".join(lang_names))
-        lang_name_chunks = [", ".join(c) for c in zip(*[iter(lang_names)] * 4)]
-        self.language_label.set_tooltip_text("\n".join(lang_name_chunks))
+        self.language_label.set_label(voice._lang_label)
+        self.language_label.set_tooltip_text(voice._lang_tooltip)
+        # Recycled rows are already mapped, don't crossfade from whatever
+        # status the previous voice had.
+        transition = self.stack.get_transition_type()
+        self.stack.set_transition_type(Gtk.StackTransitionType.NONE)
         self.update_status()
+        self.stack.set_transition_type(transition)
+
+    def unbind(self):
+        self.voice.disconnect(self._status_handler)
+        self._status_handler = 0
+        self.voice = None
 
     @Gtk.Template.Callback()
     def download_clicked(self, button):
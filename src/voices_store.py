@@ -17,7 +17,10 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import os, signal, re, pathlib, subprocess
+import os, signal, pathlib, subprocess, hashlib, json, threading, time, shlex
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import gi
 
 gi.require_version("Flatpak", "1.0")
@@ -30,9 +33,106 @@ os.environ["FLATPAK_USER_DIR"] = str(
     pathlib.Path.home() / ".local" / "share" / "flatpak"
 )
 
+_APPSTREAM_CACHE_DIR = (
+    pathlib.Path(GLib.get_user_cache_dir()) / "spiel-installer" / "appstream"
+)
+
+
+@lru_cache(maxsize=1024)
+def _lang(tag):
+    return Language.get(standardize_tag(tag))
+
+
+@lru_cache(maxsize=1024)
+def _lang_display_names(tag):
+    # Returns (language and region name, language name), or None.
+    lang = _lang(tag)
+    if not lang.has_name_data():
+        return None
+    return lang.display_name(), lang.language_name()
+
+
+def _is_voice_component(summary):
+    return "Speech.Provider.Voice" in summary["id"] and len(summary["extends"]) == 1
+
+
+def _component_summary(component):
+    bundle = component.get_bundle(AppStream.BundleKind.FLATPAK)
+    return {
+        "id": component.get_id(),
+        "name": component.get_name(),
+        "languages": list(component.get_languages()),
+        "extends": list(component.get_extends()),
+        "bundle": bundle.get_id() if bundle else None,
+    }
+
+
+def _component_from_summary(summary):
+    component = AppStream.Component.new()
+    component.set_id(summary["id"])
+    component.set_name(summary["name"], None)
+    for lang in summary["languages"]:
+        component.add_language(lang, 100)
+    for extends in summary["extends"]:
+        component.add_extends(extends)
+    if summary["bundle"]:
+        bundle = AppStream.Bundle.new()
+        bundle.set_kind(AppStream.BundleKind.FLATPAK)
+        bundle.set_id(summary["bundle"])
+        component.add_bundle(bundle)
+    return component
+
+
+def _parse_voice_catalog(app_stream_file):
+    """Parse an appstream catalog, keeping only voices and their providers."""
+    md = AppStream.Metadata.new()
+    md.set_format_style(AppStream.FormatStyle.CATALOG)
+    md.parse_file(app_stream_file, 1)
+    components = {c.get_id(): c for c in md.get_components().as_array()}
+    summaries = {}
+    for component in components.values():
+        summary = _component_summary(component)
+        if _is_voice_component(summary) and summary["extends"][0] in components:
+            provider = components[summary["extends"][0]]
+            summaries[summary["id"]] = summary
+            summaries[provider.get_id()] = _component_summary(provider)
+    return summaries
+
+
+def _appstream_cache_file(path):
+    digest = hashlib.sha1(path.encode()).hexdigest()
+    return _APPSTREAM_CACHE_DIR / f"{digest}.json"
+
+
+def _appstream_cache_key(path):
+    # Names are localized at parse time, so the locale is part of the key.
+    return [os.stat(path).st_mtime_ns, GLib.get_language_names()[0]]
+
+
+def _appstream_cache_load(path, key):
+    try:
+        with open(_appstream_cache_file(path)) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("key") != key:
+        return None
+    return cached.get("components")
+
+
+def _appstream_cache_store(path, key, summaries):
+    try:
+        _APPSTREAM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(_appstream_cache_file(path), "w") as f:
+            json.dump({"key": key, "components": summaries}, f)
+    except OSError:
+        pass
+
 
 class _VoiceInstaller:
     _FLATPAK_SP = ("flatpak-spawn", "--host")
+    _HOST_RC = "__SPIEL_INSTALLER_RC__:"
+    _MAX_JOBS = 2
 
     def __new__(cls):
         if not hasattr(cls, "instance"):
@@ -40,8 +140,17 @@ class _VoiceInstaller:
         return cls.instance
 
     def __init__(self):
-        self.queue = []
+        # __new__ hands back the same instance every time, don't reset it.
+        if hasattr(self, "_queues"):
+            return
+        # Operations on the same provider run one at a time, in order. Up to
+        # _MAX_JOBS providers are worked on at once.
+        self._queues = {}
+        self._running = set()
+        self._host_shells = []
+        self._host_shells_lock = threading.Lock()
         self._proc_launcher = None
+        self._dbus_iface = None
         self._command_prefix = []
         if os.path.exists("/.flatpak-info"):
             try:
@@ -54,34 +163,42 @@ class _VoiceInstaller:
             except:
                 self._command_prefix = []
 
+    def _queue_job(self, func, callback, voice, cancellable):
+        provider_id = voice.provider_component.get_id()
+        self._queues.setdefault(provider_id, deque()).append(
+            (func, callback, voice, cancellable)
+        )
+        self._pump_queue()
+
     def _pump_queue(self):
-        if not self.queue:
-            return
-        func, args = self.queue.pop(0)
-        func(*args)
+        for provider_id, queue in list(self._queues.items()):
+            if len(self._running) >= self._MAX_JOBS:
+                break
+            if provider_id in self._running:
+                continue
+            func, callback, voice, cancellable = queue.popleft()
+            if not queue:
+                del self._queues[provider_id]
+            self._running.add(provider_id)
+            task = Gio.Task.new(voice, cancellable, callback, None)
+            task.run_in_thread(func)
+
+    def _job_done(self, voice):
+        self._running.discard(voice.provider_component.get_id())
+        self._pump_queue()
 
     def install_voice(self, voice, cancellable):
-        self.queue.append((self._do_install_voice, (voice, cancellable)))
-        if len(self.queue) == 1:
-            self._pump_queue()
-
-    def _do_install_voice(self, voice, cancellable):
         if voice.status != VoiceStatus.UNINSTALLED:
             return
         voice.update_status(VoiceStatus.INSTALLING)
-        task = Gio.Task.new(voice, cancellable, self._install_sync_done, None)
-        task.run_in_thread(self._install_sync)
+        self._queue_job(self._install_sync, self._install_sync_done, voice, cancellable)
 
     def _install_sync(self, task, voice, task_data, cancellable):
         remote_name = voice.remote.get_name()
         voice_ref = voice.voice_component.get_bundle(AppStream.BundleKind.FLATPAK)
-        args = [
-            "flatpak",
-            "install",
-            "--noninteractive",
-            remote_name,
-            voice_ref.get_id(),
-        ]
+        refs = [voice_ref.get_id()]
+        # Not cached: the installation monitor sees every operation change it,
+        # so a cached list would be invalidated before the next install.
         installed_refs = set(
             [r.get_name() for r in voice.installation.list_installed_refs(cancellable)]
         )
@@ -89,13 +206,23 @@ class _VoiceInstaller:
             provider_ref = voice.provider_component.get_bundle(
                 AppStream.BundleKind.FLATPAK
             )
-            args.append(provider_ref.get_id())
+            refs.append(provider_ref.get_id())
 
-        print(args)
-        rc = subprocess.run(self._command_prefix + args)
+        if self._command_prefix:
+            success = self._run_flatpak(
+                ["install", "--noninteractive", remote_name] + refs
+            )
+        else:
+            success = self._run_transaction(
+                voice.installation,
+                lambda transaction: self._add_install_refs(
+                    transaction, remote_name, refs
+                ),
+                cancellable,
+            )
 
         self._restart_service(voice.provider_component.get_id())
-        task.return_boolean(rc.returncode == 0)
+        task.return_boolean(success)
 
     def _install_sync_done(self, voice, task, user_data):
         success = task.propagate_boolean()
@@ -104,29 +231,32 @@ class _VoiceInstaller:
         else:
             voice.update_status(VoiceStatus.UNINSTALLED)
 
-        self._pump_queue()
+        self._job_done(voice)
 
     def uninstall_voice(self, voice, cancellable):
-        self.queue.append((self._do_uninstall_voice, (voice, cancellable)))
-        if len(self.queue) == 1:
-            self._pump_queue()
-
-    def _do_uninstall_voice(self, voice, cancellable):
         if voice.status != VoiceStatus.INSTALLED:
             return
         voice.update_status(VoiceStatus.UNINSTALLING)
-        task = Gio.Task.new(voice, cancellable, self._uninstall_sync_done, None)
-        task.run_in_thread(self._uninstall_sync)
+        self._queue_job(
+            self._uninstall_sync, self._uninstall_sync_done, voice, cancellable
+        )
 
     def _uninstall_sync(self, task, voice, task_data, cancellable):
         voice_ref = voice.voice_component.get_bundle(AppStream.BundleKind.FLATPAK)
-        args = ["flatpak", "uninstall", "--noninteractive", voice_ref.get_id()]
 
-        print(args)
-        rc = subprocess.run(self._command_prefix + args)
+        if self._command_prefix:
+            success = self._run_flatpak(
+                ["uninstall", "--noninteractive", voice_ref.get_id()]
+            )
+        else:
+            success = self._run_transaction(
+                voice.installation,
+                lambda transaction: transaction.add_uninstall(voice_ref.get_id()),
+                cancellable,
+            )
 
         self._restart_service(voice.provider_component.get_id())
-        task.return_boolean(rc.returncode == 0)
+        task.return_boolean(success)
 
     def _uninstall_sync_done(self, voice, task, user_data):
         success = task.propagate_boolean()
@@ -135,37 +265,118 @@ class _VoiceInstaller:
         else:
             voice.update_status(VoiceStatus.INSTALLED)
 
-        self._pump_queue()
+        self._job_done(voice)
+
+    def _run_flatpak(self, args):
+        # From inside the sandbox we can't write to the host's installations
+        # through libflatpak, so run the host's flatpak CLI instead.
+        args = ["flatpak"] + args
+        print(args)
+        return self._run_host(args) == 0
+
+    def _run_host(self, args):
+        # Every flatpak-spawn is a portal round-trip and a fork on the host,
+        # so keep idle host shells around and feed them commands instead.
+        with self._host_shells_lock:
+            shell = self._host_shells.pop() if self._host_shells else None
+        if shell is None or shell.poll() is not None:
+            shell = subprocess.Popen(
+                self._command_prefix + ["sh"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        # The command's own output goes to stderr, stdout only carries the
+        # exit status line.
+        try:
+            shell.stdin.write(
+                f"{shlex.join(args)} </dev/null >&2; echo {self._HOST_RC}$?\n"
+            )
+            shell.stdin.flush()
+        except BrokenPipeError:
+            return -1
+        for line in shell.stdout:
+            if line.startswith(self._HOST_RC):
+                with self._host_shells_lock:
+                    self._host_shells.append(shell)
+                return int(line[len(self._HOST_RC) :])
+        # The shell went away before reporting back.
+        return -1
+
+    def _add_install_refs(self, transaction, remote_name, refs):
+        voice_ref, *provider_refs = refs
+        transaction.add_install(remote_name, voice_ref, None)
+        for ref in provider_refs:
+            try:
+                transaction.add_install(remote_name, ref, None)
+            except GLib.Error as e:
+                # The provider may have been installed since we checked.
+                if not e.matches(
+                    Flatpak.error_quark(), Flatpak.Error.ALREADY_INSTALLED
+                ):
+                    raise
+
+    def _run_transaction(self, installation, add_refs, cancellable):
+        try:
+            transaction = Flatpak.Transaction.new_for_installation(
+                installation, cancellable
+            )
+            transaction.set_no_interaction(True)
+            transaction.connect(
+                "choose-remote-for-ref", lambda transaction, ref, runtime, remotes: 0
+            )
+            add_refs(transaction)
+            transaction.run(cancellable)
+        except GLib.Error as e:
+            print(e.message)
+            return False
+        return True
 
     def _restart_service(self, service_name):
-        iface = Gio.DBusProxy.new_for_bus_sync(
-            Gio.BusType.SESSION,
-            Gio.DBusProxyFlags.NONE,
-            None,
-            "org.freedesktop.DBus",
-            "/",
-            "org.freedesktop.DBus",
-            None,
-        )
+        if self._dbus_iface is None:
+            # We only make method calls on the always-present bus daemon, so
+            # skip the property, signal and activation setup.
+            self._dbus_iface = Gio.DBusProxy.new_for_bus_sync(
+                Gio.BusType.SESSION,
+                Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
+                | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS
+                | Gio.DBusProxyFlags.DO_NOT_AUTO_START,
+                None,
+                "org.freedesktop.DBus",
+                "/org/freedesktop/DBus",
+                "org.freedesktop.DBus",
+                None,
+            )
         try:
-            pid = iface.GetConnectionUnixProcessID("(s)", service_name)
+            pid = self._dbus_iface.GetConnectionUnixProcessID("(s)", service_name)
         except Exception as e:
             # service is not running
             pass
         else:
-            rc = subprocess.run(self._command_prefix + ["kill", str(pid)])
-
-        rc = subprocess.run(
-            self._command_prefix
-            + [
-                "dbus-send",
-                "--session",
-                "--print-reply",
-                f"--dest={service_name}",
-                "/",
-                "org.freedesktop.DBus.Peer.Ping",
-            ]
-        )
+            if self._command_prefix:
+                # The pid belongs to the host's namespace, not the sandbox's.
+                self._run_host(["kill", str(pid)])
+            else:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            # Until the old process drops its name, the bus would route
+            # our activation to it instead of starting a new one.
+            self._wait_for_name_to_vanish(service_name)
+
+        try:
+            self._dbus_iface.StartServiceByName("(su)", service_name, 0)
+        except GLib.Error as e:
+            print(e.message)
+
+    def _wait_for_name_to_vanish(self, service_name, timeout=2):
+        deadline = time.monotonic() + timeout
+        while self._dbus_iface.NameHasOwner("(s)", service_name):
+            if time.monotonic() > deadline:
+                print(f"{service_name} did not exit after {timeout}s")
+                return
+            time.sleep(0.05)
 
 
 class VoiceStatus:
@@ -184,10 +395,19 @@ class Voice(GObject.Object):
         self._voice_component = voice_component
         self._provider_component = provider_component
         self._status = status
-        self._langs = [
-            Language.get(standardize_tag(l))
-            for l in self.voice_component.get_languages()
+        tags = self.voice_component.get_languages()
+        names = [n for n in map(_lang_display_names, tags) if n]
+        self._lang_region_names = tuple(sorted({n[0] for n in names}))
+        self._lang_names = tuple(sorted({n[1] for n in names}))
+        chunks = [
+            self._lang_region_names[i : i + 4]
+            for i in range(0, len(self._lang_region_names), 4)
         ]
+        self._lang_label = ", ".join(self._lang_region_names)
+        self._lang_tooltip = "\n".join(", ".join(c) for c in chunks)
+        self._search_haystack_cf = " ".join(
+            [self.name, self.provider_name] + list(self._lang_region_names)
+        ).casefold()
         super().__init__()
 
     @GObject.Property(type=Flatpak.Installation)
@@ -212,28 +432,11 @@ class Voice(GObject.Object):
 
     @GObject.Property(type=GObject.TYPE_STRV)
     def language_and_region_names(self):
-        lang_names = list(
-            set(
-                [
-                    l.display_name()
-                    for l in filter(lambda x: x.has_name_data(), self._langs)
-                ]
-            )
-        )
-        lang_names.sort()
-        return lang_names
+        return list(self._lang_region_names)
 
     @GObject.Property(type=GObject.TYPE_STRV)
     def language_names(self):
-        langs = [
-            Language.get(standardize_tag(l))
-            for l in self.voice_component.get_languages()
-        ]
-        lang_names = list(
-            set([l.language_name() for l in filter(lambda x: x.has_name_data(), langs)])
-        )
-        lang_names.sort()
-        return lang_names
+        return list(self._lang_names)
 
     @property
     def identifier(self):
@@ -260,24 +463,76 @@ class Voice(GObject.Object):
         _VoiceInstaller().uninstall_voice(self, cancellable)
 
 
+def _text_change(old, new):
+    if old == new:
+        return None
+    if new.startswith(old):
+        return Gtk.FilterChange.MORE_STRICT
+    if old.startswith(new):
+        return Gtk.FilterChange.LESS_STRICT
+    return Gtk.FilterChange.DIFFERENT
+
+
+def _selection_change(old, new):
+    # None stands for the "All" entry of a dropdown.
+    if old == new:
+        return None
+    if old is None:
+        return Gtk.FilterChange.MORE_STRICT
+    if new is None:
+        return Gtk.FilterChange.LESS_STRICT
+    return Gtk.FilterChange.DIFFERENT
+
+
 class _VoicesFilter(Gtk.Filter):
     def __init__(self):
         super().__init__()
         self._provider = None
         self._language = None
         self._text = ""
+        self._text_cf = ""
+        self._pending_change = 0
+        self._flushed_state = self._state()
 
     def set_provider(self, provider):
         self._provider = provider
-        self.changed(Gtk.FilterChange.DIFFERENT)
+        self._schedule_changed()
 
     def set_language(self, language):
         self._language = language
-        self.changed(Gtk.FilterChange.DIFFERENT)
+        self._schedule_changed()
 
     def set_text(self, text):
         self._text = text
-        self.changed(Gtk.FilterChange.DIFFERENT)
+        self._text_cf = text.casefold()
+        self._schedule_changed()
+
+    def _state(self):
+        provider_id = self._provider.get_id() if self._provider else None
+        language = self._language.get_string() if self._language else None
+        return (provider_id or None, language, self._text_cf)
+
+    def _schedule_changed(self):
+        # Coalesce bursts of setter calls (eg. typing) into a single change.
+        if self._pending_change:
+            return
+        self._pending_change = GLib.timeout_add(40, self._flush_changed)
+
+    def _flush_changed(self):
+        self._pending_change = 0
+        old_provider, old_language, old_text = self._flushed_state
+        self._flushed_state = new_provider, new_language, new_text = self._state()
+        changes = {
+            _selection_change(old_provider, new_provider),
+            _selection_change(old_language, new_language),
+            _text_change(old_text, new_text),
+        }
+        changes.discard(None)
+        if len(changes) == 1:
+            self.changed(changes.pop())
+        elif changes:
+            self.changed(Gtk.FilterChange.DIFFERENT)
+        return GLib.SOURCE_REMOVE
 
     def _match_provider(self, voice):
         return (
@@ -287,11 +542,10 @@ class _VoicesFilter(Gtk.Filter):
         )
 
     def _match_language(self, voice):
-        return not self._language or self._language.get_string() in voice.language_names
+        return not self._language or self._language.get_string() in voice._lang_names
 
     def _match_text(self, voice):
-        tokens = [voice.name, voice.provider_name] + voice.language_and_region_names
-        return not self._text or re.search(self._text, " ".join(tokens), re.IGNORECASE)
+        return not self._text_cf or self._text_cf in voice._search_haystack_cf
 
     def do_match(self, voice):
         return (
@@ -305,6 +559,10 @@ class VoicesStore(Gtk.FilterListModel):
     def __init__(self):
         super().__init__()
         self._monitors = []
+        self._change_pending = {}
+        self._last_refs = {}
+        self._voices_by_installation = {}
+        self._cancellable = Gio.Cancellable()
         self.voices_list = Gio.ListStore(item_type=Voice)
         self.providers_list = Gio.ListStore(item_type=AppStream.Component)
         self.providers_list.append(AppStream.Component(name=_("All Providers")))
@@ -314,9 +572,12 @@ class VoicesStore(Gtk.FilterListModel):
         self.set_model(self.voices_list)
 
     def populate(self):
-        task = Gio.Task.new(self, None, self._list_voices_sync_done, None)
+        task = Gio.Task.new(self, self._cancellable, self._list_voices_sync_done, None)
         task.run_in_thread(self._list_voices_sync)
 
+    def cancel(self):
+        self._cancellable.cancel()
+
     @GObject.Signal
     def populated(self):
         pass
@@ -337,62 +598,118 @@ class VoicesStore(Gtk.FilterListModel):
         filter.set_text(text)
 
     def _list_voices_sync(self, task, source_object, task_data, cancellable):
+        # Claim remotes up front so shared URLs are scanned only once, and
+        # always by the system installation first.
         visited_remotes = set()
+        scans = []
+        try:
+            for installation in [
+                Flatpak.Installation.new_system(),
+                Flatpak.Installation.new_user(),
+            ]:
+                remotes = []
+                for remote in installation.list_remotes(cancellable):
+                    url = remote.get_url()
+                    if url in visited_remotes or remote.get_disabled():
+                        continue
+                    visited_remotes.add(url)
+                    remotes.append(remote)
+                scans.append((installation, remotes))
+
+            with ThreadPoolExecutor(max_workers=len(scans)) as executor:
+                results = list(
+                    executor.map(
+                        lambda scan: self._scan_installation(*scan, cancellable),
+                        scans,
+                    )
+                )
+        except GLib.Error:
+            # libflatpak calls fail with CANCELLED once the window is closed.
+            if not cancellable.is_cancelled():
+                raise
+        if task.return_error_if_cancelled():
+            return
+
         voices = []
-        for installation in [
-            Flatpak.Installation.new_system(),
-            Flatpak.Installation.new_user(),
-        ]:
-            installed_refs = set(
-                [r.get_name() for r in installation.list_installed_refs(cancellable)]
+        monitors = []
+        last_refs = {}
+        for (installation, _), (installation_voices, monitor, installed_refs) in zip(
+            scans, results
+        ):
+            voices.extend(installation_voices)
+            monitors.append(monitor)
+            last_refs[installation] = installed_refs
+        # Sort here so the main thread can insert everything in one splice.
+        voices.sort(
+            key=lambda v: (
+                (v.provider_name or "").casefold(),
+                (v.name or "").casefold(),
             )
-            monitor = installation.create_monitor(cancellable)
-            monitor.connect("changed", self._on_installation_changed, installation)
-            self._monitors.append(monitor)
-            for remote in installation.list_remotes(cancellable):
-                url = remote.get_url()
-                if url in visited_remotes or remote.get_disabled():
-                    continue
-                visited_remotes.add(url)
-                appstream_dir = remote.get_appstream_dir()
-                if not appstream_dir.query_exists():
-                    continue
-                app_stream_file = Gio.File.new_build_filenamev(
-                    [appstream_dir.get_path(), "appstream.xml.gz"]
-                )
-                md = AppStream.Metadata.new()
-                md.set_format_style(AppStream.FormatStyle.CATALOG)
-                md.parse_file(app_stream_file, 1)
-                components = dict(
-                    [[c.get_id(), c] for c in md.get_components().as_array()]
-                )
-                for component in components.values():
-                    if (
-                        "Speech.Provider.Voice" in component.get_id()
-                        and len(component.get_extends()) == 1
-                    ):
-                        provider = components[component.get_extends()[0]]
-                        status = (
-                            VoiceStatus.INSTALLED
-                            if component.get_id() in installed_refs
-                            else VoiceStatus.UNINSTALLED
-                        )
-                        voices.append(
-                            Voice(installation, remote, component, provider, status)
-                        )
-        task.return_value(voices)
+        )
+        task.return_value((voices, monitors, last_refs))
 
-    def _list_voices_sync_done(self, source, task, user_data):
-        _, voices = task.propagate_value()
+    def _scan_installation(self, installation, remotes, cancellable):
+        installed_refs = frozenset(
+            [r.get_name() for r in installation.list_installed_refs(cancellable)]
+        )
+        monitor = installation.create_monitor(cancellable)
+        monitor.connect("changed", self._on_installation_changed, installation)
+        voices = []
+        for remote in remotes:
+            if cancellable.is_cancelled():
+                break
+            appstream_dir = remote.get_appstream_dir()
+            if not appstream_dir.query_exists():
+                continue
+            app_stream_file = Gio.File.new_build_filenamev(
+                [appstream_dir.get_path(), "appstream.xml.gz"]
+            )
+            path = app_stream_file.get_path()
+            key = _appstream_cache_key(path)
+            summaries = _appstream_cache_load(path, key)
+            if summaries is None:
+                summaries = _parse_voice_catalog(app_stream_file)
+                _appstream_cache_store(path, key, summaries)
+            components = {
+                cpt_id: _component_from_summary(summary)
+                for cpt_id, summary in summaries.items()
+            }
+            for cpt_id, summary in summaries.items():
+                if _is_voice_component(summary):
+                    component = components[cpt_id]
+                    provider = components[summary["extends"][0]]
+                    status = (
+                        VoiceStatus.INSTALLED
+                        if cpt_id in installed_refs
+                        else VoiceStatus.UNINSTALLED
+                    )
+                    voices.append(
+                        Voice(installation, remote, component, provider, status)
+                    )
+        return voices, monitor, installed_refs
 
-        providers = list(
-            dict(
-                [[v.provider_component.get_id(), v.provider_component] for v in voices]
-            ).values()
+    def _list_voices_sync_done(self, source, task, user_data):
+        try:
+            _, (voices, monitors, last_refs) = task.propagate_value()
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                return
+            raise
+        self._monitors.extend(monitors)
+        self._last_refs.update(last_refs)
+        for voice in voices:
+            self._voices_by_installation.setdefault(voice._installation, {}).setdefault(
+                voice.identifier, []
+            ).append(voice)
+
+        providers = sorted(
+            {
+                v.provider_component.get_id(): v.provider_component for v in voices
+            }.values(),
+            key=lambda p: (p.get_name() or "").casefold(),
         )
 
-        languages = list(set([lang for v in voices for lang in v.language_names]))
-        languages.sort()
+        languages = sorted({lang for v in voices for lang in v._lang_names})
 
         self.providers_list.splice(1, 0, providers)
         self.languages_list.splice(1, 0, languages)
@@ -403,20 +720,36 @@ class VoicesStore(Gtk.FilterListModel):
     def _on_installation_changed(
         self, monitor, file, other_file, evt_type, installation
     ):
-        installed_refs = set(
+        # Transactions touch many files, refresh once the burst is over.
+        if installation in self._change_pending:
+            GLib.source_remove(self._change_pending[installation])
+        self._change_pending[installation] = GLib.timeout_add(
+            200, self._flush_installation_change, installation
+        )
+
+    def _flush_installation_change(self, installation):
+        del self._change_pending[installation]
+        installed_refs = frozenset(
             [r.get_name() for r in installation.list_installed_refs(None)]
         )
-        for voice in self:
-            if (
-                voice._installation == installation
-                and voice._status != VoiceStatus.INSTALLING
-            ):
+        changed_refs = installed_refs ^ self._last_refs.get(installation, frozenset())
+        skipped_refs = set()
+        voices_by_id = self._voices_by_installation.get(installation, {})
+        for ref in changed_refs:
+            for voice in voices_by_id.get(ref, []):
+                if voice._status == VoiceStatus.INSTALLING:
+                    skipped_refs.add(ref)
+                    continue
                 status = (
                     VoiceStatus.INSTALLED
-                    if voice.identifier in installed_refs
+                    if ref in installed_refs
                     else VoiceStatus.UNINSTALLED
                 )
                 voice.update_status(status)
+        # Keep the old state of skipped refs so they still count as changed on
+        # the next refresh, in case the install that was running fails.
+        self._last_refs[installation] = installed_refs ^ skipped_refs
+        return GLib.SOURCE_REMOVE
 
 
 if __name__ == "__main__":
@@ -49,7 +49,12 @@ class VoiceshopWindow(Adw.ApplicationWindow):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.vstore = VoicesStore()
-        self.voices_list.bind_model(self.vstore, self._create_voice_row)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_voice_row_setup)
+        factory.connect("bind", self._on_voice_row_bind)
+        factory.connect("unbind", self._on_voice_row_unbind)
+        self.voices_list.set_factory(factory)
+        self.voices_list.set_model(Gtk.NoSelection.new(self.vstore))
 
         self.providers_dropdown.set_expression(
             Gtk.PropertyExpression.new(
@@ -78,6 +83,11 @@ class VoiceshopWindow(Adw.ApplicationWindow):
             "clicked", self._on_instructions_button_clicked
         )
 
+    def do_close_request(self):
+        # Stop scanning remotes if we're closed before populating is done.
+        self.vstore.cancel()
+        return Adw.ApplicationWindow.do_close_request(self)
+
     def _on_provider_changed(self, dropdown, params):
         self.vstore.set_provider_filter(self.providers_dropdown.get_selected_item())
 
@@ -105,8 +115,15 @@ class VoiceshopWindow(Adw.ApplicationWindow):
         launcher = Gtk.UriLauncher.new("https://project-spiel.org/install.html")
         launcher.launch(self, None, None)
 
-    def _create_voice_row(self, voice):
-        return VoiceRow(voice)
+    def _on_voice_row_setup(self, factory, list_item):
+        list_item.set_activatable(False)
+        list_item.set_child(VoiceRow())
+
+    def _on_voice_row_bind(self, factory, list_item):
+        list_item.get_child().bind(list_item.get_item())
+
+    def _on_voice_row_unbind(self, factory, list_item):
+        list_item.get_child().unbind()
 
     @Gtk.Template.Callback()
     def _search_changed(self, entry):